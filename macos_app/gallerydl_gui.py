@@ -10,7 +10,11 @@ L'app est pensée pour être empaquetée en .app (via PyInstaller par exemple),
 mais fonctionne aussi en mode script (`python macos_app/gallerydl_gui.py`).
 """
 
-import queue
+import codecs
+import itertools
+import os
+import re
+import shutil
 import subprocess
 import sys
 import threading
@@ -18,7 +22,7 @@ import tkinter as tk
 from pathlib import Path
 from tkinter import filedialog, messagebox, ttk
 from tkinter.scrolledtext import ScrolledText
-from typing import List, Optional
+from typing import Callable, List, Optional
 
 try:  # pragma: no cover - handled both as script and module
     from . import twitter_index
@@ -26,6 +30,45 @@ except ImportError:  # pragma: no cover
     import twitter_index  # type: ignore
 
 
+def _resolve_gallery_dl_command() -> List[str]:
+    """Retourne la commande de base utilisée pour lancer gallery-dl.
+
+    Une application figée (PyInstaller) ne peut pas exécuter ``-m gallery_dl``
+    avec ``sys.executable`` : on se rabat alors sur le script ``gallery-dl``
+    installé dans le PATH.
+    """
+    if getattr(sys, "frozen", False):
+        return [shutil.which("gallery-dl") or "gallery-dl"]
+    return [sys.executable, "-m", "gallery_dl"]
+
+
+GALLERY_DL_COMMAND = _resolve_gallery_dl_command()
+
+# Détecte les URLs X.com / Twitter pour lesquelles un index HTML peut être généré.
+X_URL_PATTERN = re.compile(r"(?:x|twitter)\.com")
+
+# Nombre d'URLs reprises dans la ligne « Commande lancée ».
+COMMAND_LOG_MAX_URLS = 5
+
+# Nombre maximal de lignes conservées dans la zone « Sortie ».
+MAX_OUTPUT_LINES = 2000
+
+# Procédure Tcl qui ajoute du texte à la zone « Sortie » (en lecture seule),
+# la tronque à MAX_OUTPUT_LINES lignes et la fait défiler, en un seul appel.
+APPEND_TEXT_PROC = """
+proc gallerydl_append {w text maxlines} {
+    $w configure -state normal
+    $w insert end $text
+    set excess [expr {[lindex [split [$w index end-1c] .] 0] - $maxlines}]
+    if {$excess > 0} {
+        $w delete 1.0 [expr {$excess + 1}].0
+    }
+    $w see end
+    $w configure -state disabled
+}
+"""
+
+
 class GalleryDLApp(tk.Tk):
     """Fenêtre principale de l'interface gallery-dl."""
 
@@ -41,14 +84,13 @@ class GalleryDLApp(tk.Tk):
         self._browser_var = tk.StringVar()
         self._browser_domain_var = tk.StringVar(value="x.com")
         self._build_html_var = tk.BooleanVar(value=True)
-        self._last_urls: List[str] = []
+        self._is_x_target = False
+        self._output_dir: Optional[Path] = None
         self._process: Optional[subprocess.Popen] = None
         self._reader_thread: Optional[threading.Thread] = None
-        self._log_queue: queue.Queue = queue.Queue()
-        self._poll_after_id: Optional[str] = None
+        self._index_thread: Optional[threading.Thread] = None
 
         self._build_widgets()
-        self._poll_queue()
 
     # region UI setup --------------------------------------------------
     def _build_widgets(self) -> None:
@@ -148,6 +190,7 @@ class GalleryDLApp(tk.Tk):
         ttk.Label(main, text="Sortie :").pack(anchor=tk.W)
         self._output_text = ScrolledText(main, height=12, state=tk.DISABLED)
         self._output_text.pack(fill=tk.BOTH, expand=True)
+        self.tk.eval(APPEND_TEXT_PROC)
 
         status_bar = ttk.Label(self, textvariable=self._status_var, anchor=tk.W)
         status_bar.pack(fill=tk.X, side=tk.BOTTOM, padx=5, pady=5)
@@ -183,8 +226,9 @@ class GalleryDLApp(tk.Tk):
         except OSError as exc:
             messagebox.showerror("Erreur", f"Impossible d'utiliser ce dossier : {exc}")
             return
+        self._output_dir = output_dir
 
-        command = [sys.executable, "-m", "gallery_dl", "-d", str(output_dir)]
+        command = [*GALLERY_DL_COMMAND, "-d", str(output_dir)]
 
         cookies_file = self._cookies_file_var.get().strip()
         if cookies_file:
@@ -195,25 +239,38 @@ class GalleryDLApp(tk.Tk):
         if browser:
             command.extend(["--cookies-from-browser", f"{browser}/{domain}"])
 
-        target_x = any("x.com" in url or "twitter.com" in url for url in urls)
-        if target_x and self._build_html_var.get():
+        self._is_x_target = bool(X_URL_PATTERN.search("\n".join(urls)))
+        if self._is_x_target and self._build_html_var.get():
             command.append("--write-metadata")
 
-        self._last_urls = urls
+        banner = " ".join(itertools.chain(command, urls[:COMMAND_LOG_MAX_URLS]))
+        if len(urls) > COMMAND_LOG_MAX_URLS:
+            banner += f" … (+{len(urls) - COMMAND_LOG_MAX_URLS} URLs)"
         command.extend(urls)
-        self._process = subprocess.Popen(
-            command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
-        )
+        try:
+            process = subprocess.Popen(
+                command,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                bufsize=0,
+                # La sortie est décodée en UTF-8, quelle que soit la locale héritée.
+                env=dict(os.environ, PYTHONIOENCODING="utf-8"),
+            )
+        except OSError as exc:
+            # Typiquement : gallery-dl introuvable dans le PATH d'une app lancée
+            # depuis le Finder.
+            messagebox.showerror("Erreur", f"Impossible de lancer gallery-dl : {exc}")
+            return
+        self._process = process
 
-        self._drain_queue()
-        self._append_text(f"Commande lancée : {' '.join(command)}\n")
+        self._append_text(f"Commande lancée : {banner}\n")
 
         self._reader_thread = threading.Thread(
-            target=self._read_process_output, daemon=True
+            target=self._read_process_output,
+            args=(process,),
+            name="gallery-dl-output",
+            daemon=True,
         )
         self._reader_thread.start()
 
@@ -232,63 +289,101 @@ class GalleryDLApp(tk.Tk):
 
     def _collect_urls(self) -> List[str]:
         raw = self._urls_input.get("1.0", tk.END)
-        urls = [line.strip() for line in raw.splitlines() if line.strip()]
-        return urls
-
-    def _read_process_output(self) -> None:
-        """Thread secondaire qui lit la sortie du processus et l'alimente dans la file."""
-        assert self._process and self._process.stdout
-        for line in self._process.stdout:
-            self._log_queue.put(line)
-        self._process.wait()
-        self._log_queue.put(f"\nProcessus terminé (code {self._process.returncode}).\n")
-        self._log_queue.put("__EOF__")
-
-    def _poll_queue(self) -> None:
-        """Transfère les messages de la file dans la zone de texte UI."""
+        return [url for url in map(str.strip, raw.split("\n")) if url]
+
+    def _read_process_output(self, process: subprocess.Popen) -> None:
+        """Thread secondaire qui lit la sortie du processus par blocs et la transmet à l'UI."""
+        assert process.stdout
+        fd = process.stdout.fileno()
+        decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        carry = b""
+        while True:
+            chunk = os.read(fd, 65536)
+            data = carry + chunk
+            # Un « \r » final peut précéder le « \n » du bloc suivant.
+            if chunk and data.endswith(b"\r"):
+                data, carry = data[:-1], b"\r"
+            else:
+                carry = b""
+            data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+            text = decoder.decode(data, final=not chunk)
+            if text:
+                self._post(self._on_output, process, text)
+            if not chunk:
+                break
+        process.wait()
+        self._post(self._on_process_exit, process)
+
+    def _post(self, callback: Callable[..., None], *args) -> None:
+        """Planifie *callback* sur le thread Tk depuis le thread de lecture."""
         try:
-            while True:
-                item = self._log_queue.get_nowait()
-                if item == "__EOF__":
-                    self._start_button.configure(state=tk.NORMAL)
-                    self._stop_button.configure(state=tk.DISABLED)
-                    status = (
-                        "Téléchargement terminé."
-                        if self._process and self._process.returncode == 0
-                        else "Commande terminée avec erreurs."
-                    )
-                    self._status_var.set(status)
-                    if (
-                        status == "Téléchargement terminé."
-                        and self._build_html_var.get()
-                        and any("x.com" in url or "twitter.com" in url for url in self._last_urls)
-                    ):
-                        self._generate_html_index()
-                    self._process = None
-                    return
-                self._append_text(item)
-        except queue.Empty:
+            self.after(0, callback, *args)
+        except (RuntimeError, tk.TclError):
+            # Fenêtre déjà détruite : la sortie restante est ignorée.
             pass
-        finally:
-            # Planifie la prochaine vérification
-            self._poll_after_id = self.after(150, self._poll_queue)
+
+    def _on_output(self, process: subprocess.Popen, text: str) -> None:
+        if process is self._process:
+            self._append_text(text)
+
+    def _on_process_exit(self, process: subprocess.Popen) -> None:
+        if process is not self._process:
+            return
+        self._append_text(f"\nProcessus terminé (code {process.returncode}).\n")
+        self._stop_button.configure(state=tk.DISABLED)
+        status = (
+            "Téléchargement terminé."
+            if process.returncode == 0
+            else "Commande terminée avec erreurs."
+        )
+        self._status_var.set(status)
+        if (
+            status == "Téléchargement terminé."
+            and self._build_html_var.get()
+            and self._is_x_target
+        ):
+            self._generate_html_index()
+        if self._index_thread is None:
+            self._start_button.configure(state=tk.NORMAL)
+        self._process = None
 
     def _append_text(self, text: str) -> None:
-        self._output_text.configure(state=tk.NORMAL)
-        self._output_text.insert(tk.END, text)
-        self._output_text.see(tk.END)
-        self._output_text.configure(state=tk.DISABLED)
+        self.tk.call("gallerydl_append", self._output_text, text, MAX_OUTPUT_LINES)
 
     # endregion Command execution -------------------------------------
 
     def _generate_html_index(self) -> None:
+        output_dir = self._output_dir
+        if output_dir is None or self._index_thread is not None:
+            return
+        self._append_text("Génération de l'index HTML…\n")
+        # « Télécharger » reste désactivé jusqu'à _on_html_index_done : un second
+        # téléchargement pourrait sinon réécrire les mêmes index.html en parallèle.
+        self._index_thread = threading.Thread(
+            target=self._build_html_index,
+            args=(output_dir,),
+            name="gallery-dl-html-index",
+            daemon=True,
+        )
+        self._index_thread.start()
+
+    def _build_html_index(self, output_dir: Path) -> None:
+        """Thread secondaire : construit les index HTML sans bloquer l'UI."""
         try:
-            output_dir = Path(self._directory_var.get()).expanduser()
-            created = twitter_index.build_indexes(output_dir, recursive=True, overwrite=True)
+            # Sans processus de travail : ils survivraient à la fermeture de la fenêtre.
+            created = twitter_index.build_indexes(
+                output_dir, recursive=True, overwrite=True, parallel=False
+            )
         except Exception as exc:  # pragma: no cover - UI surface
-            self._append_text(f"Erreur génération HTML : {exc}\n")
-            return
+            self._post(self._append_text, f"Erreur génération HTML : {exc}\n")
+            created = None
+        self._post(self._on_html_index_done, created)
 
+    def _on_html_index_done(self, created: Optional[List[Path]]) -> None:
+        self._index_thread = None
+        self._start_button.configure(state=tk.NORMAL)
+        if created is None:
+            return
         if not created:
             self._append_text("Aucun index HTML généré (métadonnées manquantes ?).\n")
         else:
@@ -303,17 +398,7 @@ class GalleryDLApp(tk.Tk):
         if file_path:
             self._cookies_file_var.set(file_path)
 
-    def _drain_queue(self) -> None:
-        try:
-            while True:
-                self._log_queue.get_nowait()
-        except queue.Empty:
-            pass
-
     def destroy(self) -> None:  # type: ignore[override]
-        if self._poll_after_id is not None:
-            self.after_cancel(self._poll_after_id)
-            self._poll_after_id = None
         if self._process and self._process.poll() is None:
             self._process.terminate()
         super().destroy()
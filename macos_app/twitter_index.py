@@ -13,17 +13,46 @@ Il peut être utilisé de deux façons :
 import argparse
 import html
 import json
+import os
 import re
 import sys
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from functools import cached_property
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import AbstractSet, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
 
 URL_PATTERN = re.compile(r"(https?://[^\s]+)")
 IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".gif", ".jfif"}
 VIDEO_EXTENSIONS = {".mp4", ".webm", ".mov", ".mkv", ".m4v"}
+MEDIA_TYPES = {
+    **dict.fromkeys(IMAGE_EXTENSIONS, "image"),
+    **dict.fromkeys(VIDEO_EXTENSIONS, "video"),
+}
+LOG_LINE_PATTERN = re.compile(r"\[(?:.*\]|.*\)$)")
+DATE_PATTERN = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})[ T](\d{2}):(\d{2}):(\d{2})"
+    r"(?:(Z)|([+-])(\d{2}):?(\d{2}))?$"
+)
+_DATE_FORMATS = ("%Y-%m-%d %H:%M:%S%z", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S%z")
+
+_json_loads = orjson.loads if orjson else json.loads
+_STATS = (
+    ("replies", "reply_count", "Réponses"),
+    ("retweets", "retweet_count", "Retweets"),
+    ("quotes", "quote_count", "Citations"),
+    ("likes", "favorite_count", "J'aime"),
+    ("bookmarks", "bookmark_count", "Favoris"),
+    ("views", "view_count", "Vues"),
+)
+_TWITTER_MARKER = b'"twitter"'
 
 
 @dataclass
@@ -46,20 +75,16 @@ class Tweet:
     mentions: List[str] = field(default_factory=list)
     stats: Dict[str, Optional[int]] = field(default_factory=dict)
     attachments: List[Attachment] = field(default_factory=list)
+    hashtags_lower: List[str] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.hashtags_lower = [tag.lower() for tag in self.hashtags]
 
-    @property
+    @cached_property
     def date(self) -> Optional[datetime]:
         if not self.date_raw:
             return None
-        for fmt in ("%Y-%m-%d %H:%M:%S%z", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S%z"):
-            try:
-                return datetime.strptime(self.date_raw, fmt)
-            except ValueError:
-                continue
-        try:
-            return datetime.fromisoformat(self.date_raw)
-        except ValueError:
-            return None
+        return _parse_date(self.date_raw)
 
 
 def build_indexes(
@@ -67,29 +92,37 @@ def build_indexes(
     *,
     recursive: bool = True,
     overwrite: bool = True,
+    parallel: bool = True,
+    parallel_min_entries: int = 4000,
 ) -> List[Path]:
-    """Build index.html files for all twitter export folders under *root*."""
-    root = root.expanduser().resolve()
-    if recursive:
-        metadata_iter = root.rglob("*.json")
-    else:
-        metadata_iter = root.glob("*.json")
+    """Build index.html files for all twitter export folders under *root*.
 
+    With *parallel*, folders are rendered in separate processes when more than
+    one CPU is available and there are at least *parallel_min_entries* sidecars.
+    """
+    root = root.expanduser().resolve()
     grouped: Dict[Path, List[Tuple[Path, dict]]] = defaultdict(list)
-    for meta_path in metadata_iter:
-        if not meta_path.is_file():
-            continue
-        data = _load_json(meta_path)
+    for meta_path in _iter_json_files(root, recursive):
+        data = _load_json(meta_path, _TWITTER_MARKER)
         if data is None or data.get("category") != "twitter":
             continue
         grouped[meta_path.parent].append((meta_path, data))
 
-    created: List[Path] = []
-    for directory, entries in grouped.items():
-        index_path = build_index(directory, entries=entries, overwrite=overwrite)
-        if index_path:
-            created.append(index_path)
-    return created
+    workers = min(len(grouped), os.cpu_count() or 1)
+    total = sum(map(len, grouped.values()))
+    if parallel and workers >= 2 and total >= parallel_min_entries:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(build_index, directory, entries=entries, overwrite=overwrite)
+                for directory, entries in grouped.items()
+            ]
+            results = [future.result() for future in futures]
+    else:
+        results = [
+            build_index(directory, entries=entries, overwrite=overwrite)
+            for directory, entries in grouped.items()
+        ]
+    return [index_path for index_path in results if index_path]
 
 
 def build_index_from_jsonl(
@@ -102,19 +135,21 @@ def build_index_from_jsonl(
     if not json_file.is_file():
         raise FileNotFoundError(json_file)
 
-    entries: List[Tuple[Path, dict]] = []
+    output_path = (output or json_file.with_suffix(".html")).expanduser().resolve()
+    accumulator = TweetAccumulator(output_path.parent)
+    first: Optional[dict] = None
     log_messages: List[str] = []
     with json_file.open("r", encoding="utf-8") as handle:
         for line in handle:
             line = line.strip()
             if not line:
                 continue
-            if line.startswith("[") and line.endswith(")") or line.startswith("[") and "]" in line:
+            if line[0] == "[" and LOG_LINE_PATTERN.match(line):
                 log_messages.append(line)
                 continue
             try:
-                data = json.loads(line)
-            except json.JSONDecodeError:
+                data = _json_loads(line)
+            except ValueError:
                 log_messages.append(line)
                 continue
             if isinstance(data, str):
@@ -122,28 +157,28 @@ def build_index_from_jsonl(
                 continue
             if data.get("category") != "twitter":
                 continue
-            entries.append((json_file, data))
+            if first is None:
+                first = data
+            accumulator.feed(json_file, data)
 
-    if not entries:
+    if first is None:
         for message in log_messages:
             print(message)
         return None
 
-    output_path = (output or json_file.with_suffix(".html")).expanduser().resolve()
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    tweets = _tweets_from_metadata(output_path.parent, entries)
+    tweets = accumulator.finalize()
     if not tweets:
         return None
 
-    all_tags = sorted({tag.lower() for tweet in tweets for tag in tweet.hashtags})
+    all_tags = sorted({tag for tweet in tweets for tag in tweet.hashtags_lower})
     label = (
-        entries[0][1].get("search")
-        or entries[0][1].get("user", {}).get("name")
+        first.get("search")
+        or first.get("user", {}).get("name")
         or output_path.stem
     )
-    html_content = _render_timeline(label, tweets, all_tags)
-    output_path.write_text(html_content, encoding="utf-8")
+    _write_timeline(output_path, label, tweets, all_tags)
     for message in log_messages:
         print(message)
     return output_path
@@ -160,7 +195,7 @@ def build_index(
     if entries is None:
         collected: List[Tuple[Path, dict]] = []
         for path in directory.glob("*.json"):
-            data = _load_json(path)
+            data = _load_json(path, _TWITTER_MARKER)
             if data and data.get("category") == "twitter":
                 collected.append((path, data))
         entries = collected
@@ -173,32 +208,52 @@ def build_index(
     if index_path.exists() and not overwrite:
         return index_path
 
-    all_tags = sorted({tag.lower() for tweet in tweets for tag in tweet.hashtags})
-    html_content = _render_timeline(directory.name, tweets, all_tags)
-    index_path.write_text(html_content, encoding="utf-8")
+    all_tags = sorted({tag for tweet in tweets for tag in tweet.hashtags_lower})
+    _write_timeline(index_path, directory.name, tweets, all_tags)
     return index_path
 
 
-def _load_json(path: Path) -> Optional[dict]:
+def _iter_json_files(root: Path, recursive: bool) -> Iterator[Path]:
+    """Yield the ``*.json`` files under *root*, skipping symlinked directories."""
+    pending = [str(root)]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.name.endswith(".json") and entry.is_file():
+                yield Path(entry.path)
+            elif recursive and entry.is_dir(follow_symlinks=False):
+                pending.append(entry.path)
+
+
+def _load_json(path: Path, marker: Optional[bytes] = None) -> Optional[dict]:
+    """Parse *path*, or return None if it is unreadable or lacks *marker*."""
     try:
-        with path.open("r", encoding="utf-8") as fh:
-            return json.load(fh)
-    except (OSError, json.JSONDecodeError):
+        raw = path.read_bytes()
+        if marker is not None and marker not in raw:
+            return None
+        return _json_loads(raw)
+    except (OSError, ValueError):
         return None
 
 
-def _tweets_from_metadata(
-    directory: Path,
-    entries: Sequence[Tuple[Path, dict]],
-) -> List[Tweet]:
-    tweets: Dict[str, Tweet] = {}
-    attachments: Dict[str, Dict[int, Attachment]] = defaultdict(dict)
+class TweetAccumulator:
+    """Merge metadata records, fed one at a time, into tweets."""
 
-    for meta_path, data in entries:
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self._tweets: Dict[str, Tweet] = {}
+        self._attachments: Dict[str, List[Tuple[int, Attachment]]] = defaultdict(list)
+        self._directory_str = str(directory)
+        self._listing: Optional[AbstractSet[str]] = None
+
+    def feed(self, meta_path: Path, data: dict) -> None:
         tweet_id = _coerce_id(data)
         if not tweet_id:
-            continue
-
+            return
         author = data.get("author") or {}
         screen_name = author.get("name") or data.get("user", {}).get("name") or "unknown"
         display_name = author.get("nick") or author.get("name") or screen_name
@@ -206,200 +261,172 @@ def _tweets_from_metadata(
         hashtags = data.get("hashtags") or []
         if isinstance(hashtags, str):
             hashtags = [hashtags]
+        hashtags = [tag for tag in hashtags if tag]
         mentions = data.get("mentions") or []
         if isinstance(mentions, list):
             mentions = [mention.get("name") or "" for mention in mentions if isinstance(mention, dict)]
 
-        tweet = tweets.get(tweet_id)
+        date = data.get("date")
+        date_raw = None if date is None else str(date)
+
+        tweet = self._tweets.get(tweet_id)
         if not tweet:
             tweet = Tweet(
                 tweet_id=tweet_id,
                 author_screen_name=screen_name,
                 author_display_name=display_name,
                 content=data.get("content") or data.get("text") or "",
-                date_raw=_stringify(data.get("date")),
+                date_raw=date_raw,
                 lang=data.get("lang"),
                 permalink=permalink,
-                hashtags=[tag for tag in hashtags if tag],
+                hashtags=hashtags,
                 mentions=[mention for mention in mentions if mention],
-                stats={
-                    "replies": _safe_int(data.get("reply_count")),
-                    "retweets": _safe_int(data.get("retweet_count")),
-                    "quotes": _safe_int(data.get("quote_count")),
-                    "likes": _safe_int(data.get("favorite_count")),
-                    "bookmarks": _safe_int(data.get("bookmark_count")),
-                    "views": _safe_int(data.get("view_count")),
-                },
+                stats=_stats_from_metadata(data),
             )
-            tweets[tweet_id] = tweet
+            self._tweets[tweet_id] = tweet
         else:
             if not tweet.content:
                 tweet.content = data.get("content") or data.get("text") or tweet.content
             if not tweet.date_raw:
-                tweet.date_raw = _stringify(data.get("date"))
+                tweet.date_raw = date_raw
 
-        attachment = _attachment_from_metadata(directory, meta_path, data)
+        if self._listing is None:
+            self._listing = _list_directory(self.directory)
+        attachment = _attachment_from_metadata(
+            self._directory_str, meta_path, data, self._listing
+        )
         if attachment:
-            num = _safe_int(data.get("num")) or len(attachments[tweet_id]) + 1
-            attachments[tweet_id][num] = attachment
+            media = self._attachments[tweet_id]
+            num = _safe_int(data.get("num")) or len(media) + 1
+            media.append((num, attachment))
+
+    def finalize(self) -> List[Tweet]:
+        """Return the merged tweets, newest first."""
+        tweets = self._tweets
+        for tweet_id, media in self._attachments.items():
+            tweet = tweets.get(tweet_id)
+            if not tweet:
+                continue
+            if any(prev[0] >= cur[0] for prev, cur in zip(media, media[1:])):
+                media = sorted(dict(media).items())
+            tweet.attachments = [attachment for _, attachment in media]
+
+        ordered = sorted(
+            tweets.values(),
+            key=lambda tw: (tw.date or datetime.min, tw.tweet_id),
+            reverse=True,
+        )
+        return ordered
 
-    for tweet_id, media in attachments.items():
-        tweet = tweets.get(tweet_id)
-        if not tweet:
-            continue
-        tweet.attachments = [media[idx] for idx in sorted(media)]
 
-    ordered = sorted(
-        tweets.values(),
-        key=lambda tw: (tw.date or datetime.min, tw.tweet_id),
-        reverse=True,
-    )
-    return ordered
+def _tweets_from_metadata(
+    directory: Path,
+    entries: Iterable[Tuple[Path, dict]],
+) -> List[Tweet]:
+    accumulator = TweetAccumulator(directory)
+    for meta_path, data in entries:
+        accumulator.feed(meta_path, data)
+    return accumulator.finalize()
 
 
-def _attachment_from_metadata(directory: Path, meta_path: Path, data: dict) -> Optional[Attachment]:
-    candidates: List[Path] = []
+def _list_directory(directory: Path) -> AbstractSet[str]:
+    try:
+        with os.scandir(directory) as it:
+            return {entry.name for entry in it}
+    except OSError:
+        return frozenset()
+
+
+def _attachment_from_metadata(
+    directory: str,
+    meta_path: Path,
+    data: dict,
+    listing: AbstractSet[str],
+) -> Optional[Attachment]:
+    """Locate the media file described by *data*, using *listing* for *directory*."""
+    join = os.path.join
+    candidates: List[str] = []
     rel_hint = data.get("_path") or data.get("filepath") or ""
     if rel_hint:
-        rel_candidate = Path(rel_hint)
-        if rel_candidate.is_absolute():
-            candidates.append(rel_candidate)
+        if os.path.isabs(rel_hint):
+            candidates.append(rel_hint)
         else:
-            candidates.append((directory / rel_candidate).resolve())
+            candidates.append(os.path.normpath(join(directory, rel_hint)))
 
     filename = data.get("filename") or data.get("_filename")
     extension = data.get("extension")
     if filename:
-        base = directory / filename
-        candidates.append(base if base.suffix else base.with_suffix(f".{extension or ''}"))
-        candidates.append(directory / f"{filename}.part")
-    if meta_path.stem:
-        candidates.append(directory / meta_path.stem)
-
-    existing = next((cand for cand in candidates if cand.exists()), None)
+        if os.path.splitext(filename)[1]:
+            candidates.append(join(directory, filename))
+        else:
+            candidates.append(join(directory, f"{filename}.{extension or ''}"))
+        candidates.append(join(directory, f"{filename}.part"))
+    stem = meta_path.stem
+    if stem:
+        candidates.append(join(directory, stem))
+
+    existing = next(
+        (
+            cand
+            for cand in candidates
+            if (
+                os.path.basename(cand) in listing
+                if os.path.dirname(cand) == directory
+                else os.path.exists(cand)
+            )
+        ),
+        None,
+    )
     if not existing:
         return None
 
-    try:
-        rel_path = existing.relative_to(directory)
-    except ValueError:
-        rel_path = existing
-
-    ext = existing.suffix.lower()
-    if ext in IMAGE_EXTENSIONS:
-        media_type = "image"
-    elif ext in VIDEO_EXTENSIONS:
-        media_type = "video"
-    else:
-        media_type = "file"
+    prefix = join(directory, "")
+    rel_path = existing[len(prefix):] if existing.startswith(prefix) else existing
+    if os.sep != "/":
+        rel_path = rel_path.replace(os.sep, "/")
 
-    return Attachment(rel_path=rel_path.as_posix(), media_type=media_type, alt_text=data.get("description"))
+    media_type = MEDIA_TYPES.get(os.path.splitext(existing)[1].lower(), "file")
 
+    return Attachment(rel_path=rel_path, media_type=media_type, alt_text=data.get("description"))
 
-def _render_timeline(user_label: str, tweets: Sequence[Tweet], hashtags: Sequence[str]) -> str:
-    stats_labels = {
-        "replies": "Réponses",
-        "retweets": "Retweets",
-        "quotes": "Citations",
-        "likes": "J'aime",
-        "bookmarks": "Favoris",
-        "views": "Vues",
-    }
 
-    buttons = '\n'.join(
-        f'<button data-tag="{html.escape(tag)}">#{html.escape(tag)}</button>'
-        for tag in hashtags
-    )
-    timeline = []
-    for tweet in tweets:
-        text_html = _format_text(tweet.content)
-        date_str = tweet.date.strftime("%d %b %Y %H:%M") if tweet.date else (tweet.date_raw or "")
-        tag_attr = ",".join(tweet.hashtags)
-        media_html = "".join(_render_attachment(att) for att in tweet.attachments)
-        stats_chunks: List[str] = []
-        for name, label in stats_labels.items():
-            value = tweet.stats.get(name)
-            if value:
-                stats_chunks.append(f'<span class="stat stat-{name}">{label} : {value:,}</span>')
-        stats_html = " ".join(stats_chunks)
-        hashtag_html = " ".join(
-            f'<a href="https://x.com/hashtag/{html.escape(tag)}" target="_blank">#{html.escape(tag)}</a>'
-            for tag in tweet.hashtags
-        )
-        mentions_html = " ".join(
-            f'<a href="https://x.com/{html.escape(mention)}" target="_blank">@{html.escape(mention)}</a>'
-            for mention in tweet.mentions
-        )
-        search_terms = " ".join(
-            [
-                tweet.content,
-                " ".join(f"#{tag}" for tag in tweet.hashtags),
-                " ".join(f"@{mention}" for mention in tweet.mentions),
-            ]
-        ).lower()
-        card = f"""
-        <article class="tweet" data-hashtags="{html.escape(tag_attr)}" data-search="{html.escape(search_terms)}">
-          <header class="tweet-header">
-            <div class="avatar-circle">{html.escape(tweet.author_display_name[:1].upper())}</div>
-            <div>
-              <div class="author">
-                <span class="display-name">{html.escape(tweet.author_display_name)}</span>
-                <span class="handle">@{html.escape(tweet.author_screen_name)}</span>
-              </div>
-              <a class="timestamp" href="{html.escape(tweet.permalink)}" target="_blank">{html.escape(date_str)}</a>
-            </div>
-          </header>
-          <div class="tweet-body" lang="{html.escape(tweet.lang or '')}">{text_html}</div>
-          {"<div class='tweet-mentions'>" + mentions_html + "</div>" if mentions_html else ""}
-          {"<div class='tweet-hashtags'>" + hashtag_html + "</div>" if hashtag_html else ""}
-          {"<div class='attachments'>" + media_html + "</div>" if media_html else ""}
-          {"<footer class='tweet-stats'>" + stats_html + "</footer>" if stats_html else ""}
-        </article>
-        """
-        timeline.append(card)
-
-    return f"""<!DOCTYPE html>
-<html lang="fr">
-  <head>
-    <meta charset="utf-8">
-    <title>Exports X.com – {html.escape(user_label)}</title>
-    <style>
-      :root {{
+_PAGE_STYLE = """\
+      :root {
         color-scheme: dark;
         font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif;
         background-color: #0f1419;
         color: #e7e9ea;
-      }}
-      body {{
+      }
+      body {
         margin: 0;
         padding: 0 0 4rem;
-      }}
-      header.page-header {{
+      }
+      header.page-header {
         position: sticky;
         top: 0;
         backdrop-filter: blur(12px);
         background: rgba(15, 20, 25, 0.85);
         padding: 1.2rem 1.6rem;
         border-bottom: 1px solid rgba(231, 233, 234, 0.2);
-      }}
-      header.page-header h1 {{
+      }
+      header.page-header h1 {
         margin: 0 0 0.4rem;
         font-size: 1.5rem;
         font-weight: 700;
-      }}
-      header.page-header p {{
+      }
+      header.page-header p {
         margin: 0;
         color: #8b98a5;
         font-size: 0.95rem;
-      }}
-      .tools {{
+      }
+      .tools {
         display: flex;
         flex-wrap: wrap;
         gap: 0.8rem;
         align-items: center;
         margin-top: 0.9rem;
-      }}
-      #search-box {{
+      }
+      #search-box {
         flex: 1 1 220px;
         padding: 0.45rem 0.9rem;
         border-radius: 999px;
@@ -409,16 +436,16 @@ def _render_timeline(user_label: str, tweets: Sequence[Tweet], hashtags: Sequenc
         outline: none;
         font-size: 0.95rem;
         transition: border-color 0.2s;
-      }}
-      #search-box:focus {{
+      }
+      #search-box:focus {
         border-color: rgba(29, 155, 240, 0.7);
-      }}
-      .filters {{
+      }
+      .filters {
         display: flex;
         gap: 0.6rem;
         flex-wrap: wrap;
-      }}
-      .filters button {{
+      }
+      .filters button {
         border: 1px solid rgba(113, 118, 123, 0.4);
         border-radius: 999px;
         padding: 0.2rem 0.9rem;
@@ -426,21 +453,21 @@ def _render_timeline(user_label: str, tweets: Sequence[Tweet], hashtags: Sequenc
         color: #e7e9ea;
         cursor: pointer;
         transition: background 0.2s;
-      }}
+      }
       .filters button.active,
-      .filters button:hover {{
+      .filters button:hover {
         background: rgba(29, 155, 240, 0.2);
         border-color: rgba(29, 155, 240, 0.7);
-      }}
-      main.timeline {{
+      }
+      main.timeline {
         max-width: 720px;
         margin: 0 auto;
         padding: 1rem 1.2rem;
         display: flex;
         flex-direction: column;
         gap: 1rem;
-      }}
-      article.tweet {{
+      }
+      article.tweet {
         border: 1px solid rgba(113, 118, 123, 0.4);
         border-radius: 16px;
         padding: 1rem;
@@ -448,13 +475,13 @@ def _render_timeline(user_label: str, tweets: Sequence[Tweet], hashtags: Sequenc
         display: flex;
         flex-direction: column;
         gap: 0.75rem;
-      }}
-      .tweet-header {{
+      }
+      .tweet-header {
         display: flex;
         align-items: center;
         gap: 0.8rem;
-      }}
-      .avatar-circle {{
+      }
+      .avatar-circle {
         width: 48px;
         height: 48px;
         border-radius: 50%;
@@ -465,116 +492,240 @@ def _render_timeline(user_label: str, tweets: Sequence[Tweet], hashtags: Sequenc
         font-weight: 700;
         font-size: 1.2rem;
         color: #0f1419;
-      }}
-      .author {{
+      }
+      .author {
         display: flex;
         gap: 0.4rem;
         align-items: baseline;
-      }}
-      .display-name {{
+      }
+      .display-name {
         font-weight: 700;
-      }}
-      .handle {{
+      }
+      .handle {
         color: #8b98a5;
-      }}
-      .timestamp {{
+      }
+      .timestamp {
         color: #8b98a5;
         font-size: 0.9rem;
         text-decoration: none;
-      }}
-      .tweet-body {{
+      }
+      .tweet-body {
         white-space: pre-wrap;
         font-size: 1.05rem;
         line-height: 1.45;
-      }}
-      .tweet-body a {{
+      }
+      .tweet-body a {
         color: #1d9bf0;
         text-decoration: none;
-      }}
-      .tweet-body a:hover {{
+      }
+      .tweet-body a:hover {
         text-decoration: underline;
-      }}
-      .tweet-hashtags, .tweet-mentions {{
+      }
+      .tweet-hashtags, .tweet-mentions {
         display: flex;
         flex-wrap: wrap;
         gap: 0.5rem;
         color: #1d9bf0;
-      }}
-      .attachments {{
+      }
+      .attachments {
         display: grid;
         gap: 0.6rem;
-      }}
-      .attachments img {{
+      }
+      .attachments img {
         max-width: 100%;
         border-radius: 12px;
-      }}
-      .attachments video {{
+      }
+      .attachments video {
         max-width: 100%;
         border-radius: 12px;
-      }}
-      .attachment-file {{
+      }
+      .attachment-file {
         color: #1d9bf0;
-      }}
-      footer.tweet-stats {{
+      }
+      footer.tweet-stats {
         display: flex;
         flex-wrap: wrap;
         gap: 0.8rem;
         color: #8b98a5;
         font-size: 0.9rem;
-      }}
-      .hidden {{
+      }
+      .hidden {
         display: none !important;
-      }}
-    </style>
-  </head>
-  <body>
-    <header class="page-header">
-      <h1>Exports X.com – {html.escape(user_label)}</h1>
-      <p>{len(tweets)} publication(s) disponibles hors ligne.</p>
-      <div class="tools">
-        <input type="search" id="search-box" placeholder="Rechercher dans le fil…" autocomplete="off">
-        {"<div class='filters'><button data-tag='__all__' class='active'>Toutes</button>" + buttons + "</div>" if hashtags else ""}
-      </div>
-    </header>
-    <main class="timeline">
-      {''.join(timeline)}
+      }
+"""
+
+_PAGE_FOOTER = """\
     </main>
     <script>
       const filterButtons = document.querySelectorAll('.filters button');
       const tweets = document.querySelectorAll('article.tweet');
       const searchInput = document.querySelector('#search-box');
-      let activeTag = '__all__';
+      const tagFilter = document.createElement('style');
+      document.head.appendChild(tagFilter);
 
-      function applyFilters() {{
+      function applyTagFilter(tag) {
+        tagFilter.textContent = tag === '__all__'
+          ? ''
+          : `article.tweet:not([data-hashtags~="${CSS.escape(tag)}"]) { display: none; }`;
+      }
+
+      let searchIndex = null;
+
+      function applySearch() {
         const query = (searchInput?.value || '').trim().toLowerCase();
-        tweets.forEach(tweet => {{
-          const matchesTag = activeTag === '__all__' || (tweet.dataset.hashtags || '').split(',').filter(Boolean).includes(activeTag);
-          const matchesText = !query || (tweet.dataset.search || '').includes(query);
-          if (matchesTag && matchesText) {{
-            tweet.classList.remove('hidden');
-          }} else {{
-            tweet.classList.add('hidden');
-          }}
-        }});
-      }}
-
-      filterButtons.forEach(btn => {{
-        btn.addEventListener('click', () => {{
+        if (searchIndex === null) {
+          if (!query) {
+            return;
+          }
+          searchIndex = Array.from(tweets, tweet => {
+            const body = tweet.querySelector('.tweet-body');
+            return {
+              el: tweet,
+              text: ((body ? body.textContent : '') + ' ' + (tweet.dataset.search || '')).toLowerCase(),
+              hidden: false,
+            };
+          });
+        }
+        for (const entry of searchIndex) {
+          const hidden = query !== '' && !entry.text.includes(query);
+          if (hidden !== entry.hidden) {
+            entry.hidden = hidden;
+            entry.el.classList.toggle('hidden', hidden);
+          }
+        }
+      }
+
+      filterButtons.forEach(btn => {
+        btn.addEventListener('click', () => {
           filterButtons.forEach(b => b.classList.remove('active'));
           btn.classList.add('active');
-          activeTag = btn.dataset.tag || '__all__';
-          applyFilters();
-        }});
-      }});
-
-      if (searchInput) {{
-        searchInput.addEventListener('input', applyFilters);
-      }}
+          applyTagFilter(btn.dataset.tag || '__all__');
+        });
+      });
+
+      if (searchInput) {
+        searchInput.addEventListener('input', applySearch);
+      }
     </script>
   </body>
 </html>"""
 
 
+def _write_timeline(
+    path: Path,
+    user_label: str,
+    tweets: Sequence[Tweet],
+    hashtags: Sequence[str],
+) -> None:
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp_path.open("w", encoding="utf-8", buffering=1 << 20) as fh:
+            fh.writelines(_render_timeline_iter(user_label, tweets, hashtags))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def _render_timeline_iter(
+    user_label: str,
+    tweets: Sequence[Tweet],
+    hashtags: Sequence[str],
+) -> Iterator[str]:
+    """Yield the page in chunks: the page header, one chunk per card, the footer."""
+    esc = html.escape
+
+    tag_links = {
+        tag: f'<a href="https://x.com/hashtag/{esc(tag)}" target="_blank">#{esc(tag)}</a>'
+        for tag in {tag for tweet in tweets for tag in tweet.hashtags}
+    }
+    tag_attrs = {tag: esc(tag) for tag in {tag for tweet in tweets for tag in tweet.hashtags_lower}}
+    mention_links = {
+        mention: f'<a href="https://x.com/{esc(mention)}" target="_blank">@{esc(mention)}</a>'
+        for mention in {mention for tweet in tweets for mention in tweet.mentions}
+    }
+
+    buttons = '\n'.join(
+        f'<button data-tag="{esc_tag}">#{esc_tag}</button>'
+        for esc_tag in map(esc, hashtags)
+    )
+    yield f"""<!DOCTYPE html>
+<html lang="fr">
+  <head>
+    <meta charset="utf-8">
+    <title>Exports X.com – {esc(user_label)}</title>
+    <style>
+{_PAGE_STYLE}    </style>
+  </head>
+  <body>
+    <header class="page-header">
+      <h1>Exports X.com – {esc(user_label)}</h1>
+      <p>{len(tweets)} publication(s) disponibles hors ligne.</p>
+      <div class="tools">
+        <input type="search" id="search-box" placeholder="Rechercher dans le fil…" autocomplete="off">
+        {"<div class='filters'><button data-tag='__all__' class='active'>Toutes</button>" + buttons + "</div>" if hashtags else ""}
+      </div>
+    </header>
+    <main class="timeline">
+"""
+    for tweet in tweets:
+        parts: List[str] = []
+        append = parts.append
+        text_html = _format_text(tweet.content)
+        date = tweet.date
+        date_str = date.strftime("%d %b %Y %H:%M") if date else (tweet.date_raw or "")
+        tag_attr = " ".join([tag_attrs[tag] for tag in tweet.hashtags_lower])
+        media_html = "".join(_render_attachment(att) for att in tweet.attachments)
+        stats_chunks: List[str] = []
+        for name, _, label in _STATS:
+            value = tweet.stats.get(name)
+            if value:
+                stats_chunks.append(f'<span class="stat stat-{name}">{label} : {value:,}</span>')
+        stats_html = " ".join(stats_chunks)
+        hashtag_html = " ".join([tag_links[tag] for tag in tweet.hashtags])
+        mentions_html = " ".join([mention_links[mention] for mention in tweet.mentions])
+        search_terms = " ".join(
+            [f"#{tag}" for tag in tweet.hashtags_lower]
+            + [f"@{mention}" for mention in tweet.mentions]
+        ).lower()
+        append(f"""
+        <article class="tweet" data-hashtags="{tag_attr}" data-search="{esc(search_terms)}">
+          <header class="tweet-header">
+            <div class="avatar-circle">{esc(tweet.author_display_name[:1].upper())}</div>
+            <div>
+              <div class="author">
+                <span class="display-name">{esc(tweet.author_display_name)}</span>
+                <span class="handle">@{esc(tweet.author_screen_name)}</span>
+              </div>
+              <a class="timestamp" href="{esc(tweet.permalink)}" target="_blank">{esc(date_str)}</a>
+            </div>
+          </header>
+          <div class="tweet-body" lang="{esc(tweet.lang or '')}">{text_html}</div>""")
+        if mentions_html:
+            append("\n          <div class='tweet-mentions'>")
+            append(mentions_html)
+            append("</div>")
+        if hashtag_html:
+            append("\n          <div class='tweet-hashtags'>")
+            append(hashtag_html)
+            append("</div>")
+        if media_html:
+            append("\n          <div class='attachments'>")
+            append(media_html)
+            append("</div>")
+        if stats_html:
+            append("\n          <footer class='tweet-stats'>")
+            append(stats_html)
+            append("</footer>")
+        append("\n        </article>\n")
+        yield "".join(parts)
+
+    yield _PAGE_FOOTER
+
+
 def _render_attachment(att: Attachment) -> str:
     if att.media_type == "image":
         alt = f' alt="{html.escape(att.alt_text)}"' if att.alt_text else ""
@@ -595,9 +746,42 @@ def _render_attachment(att: Attachment) -> str:
 def _format_text(text: str) -> str:
     if not text:
         return ""
-    escaped = html.escape(text)
-    linked = URL_PATTERN.sub(lambda m: f'<a href="{html.escape(m.group(1))}" target="_blank">{html.escape(m.group(1))}</a>', escaped)
-    return linked.replace("\n", "<br>")
+    return URL_PATTERN.sub(_link_url, html.escape(text)).replace("\n", "<br>")
+
+
+def _link_url(match: "re.Match[str]") -> str:
+    url = match.group(1)
+    return f'<a href="{url}" target="_blank">{url}</a>'
+
+
+def _parse_date(value: str) -> Optional[datetime]:
+    match = DATE_PATTERN.match(value)
+    if match:
+        year, month, day, hour, minute, second, utc, sign, tz_hours, tz_minutes = match.groups()
+        try:
+            if utc:
+                tzinfo: Optional[timezone] = timezone.utc
+            elif sign:
+                offset = timedelta(hours=int(tz_hours), minutes=int(tz_minutes))
+                tzinfo = timezone(-offset if sign == "-" else offset)
+            else:
+                tzinfo = None
+            return datetime(
+                int(year), int(month), int(day),
+                int(hour), int(minute), int(second),
+                tzinfo=tzinfo,
+            )
+        except ValueError:
+            pass
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
 
 
 def _coerce_id(data: dict) -> Optional[str]:
@@ -608,12 +792,14 @@ def _coerce_id(data: dict) -> Optional[str]:
     return None
 
 
-def _stringify(value) -> Optional[str]:
-    if value is None:
-        return None
-    if isinstance(value, str):
-        return value
-    return str(value)
+def _stats_from_metadata(data: dict) -> Dict[str, Optional[int]]:
+    stats: Dict[str, Optional[int]] = {}
+    for name, key, _ in _STATS:
+        try:
+            stats[name] = int(data.get(key))
+        except (TypeError, ValueError):
+            stats[name] = None
+    return stats
 
 
 def _safe_int(value) -> Optional[int]:
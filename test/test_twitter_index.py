@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 2 as
+# published by the Free Software Foundation.
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+import datetime
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "macos_app"))
+import twitter_index  # noqa E402
+
+
+def parse_date_strptime(value):
+    """Date parsing as done before DATE_PATTERN was introduced"""
+    for fmt in ("%Y-%m-%d %H:%M:%S%z", "%Y-%m-%d %H:%M:%S",
+                "%Y-%m-%dT%H:%M:%S%z"):
+        try:
+            return datetime.datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    try:
+        return datetime.datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+class TestParseDate(unittest.TestCase):
+
+    def test_parse_date(self, f=twitter_index._parse_date):
+        utc = datetime.timezone.utc
+        cet = datetime.timezone(datetime.timedelta(hours=1))
+        ist = datetime.timezone(-datetime.timedelta(hours=5, minutes=30))
+
+        for value, expected in (
+            ("2024-01-02 03:04:05",
+             datetime.datetime(2024, 1, 2, 3, 4, 5)),
+            ("2024-01-02T03:04:05",
+             datetime.datetime(2024, 1, 2, 3, 4, 5)),
+            ("2024-01-02 03:04:05Z",
+             datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=utc)),
+            ("2024-01-02 03:04:05+01:00",
+             datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=cet)),
+            ("2024-01-02T03:04:05-0530",
+             datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=ist)),
+            ("2024-1-2 3:4:5",
+             datetime.datetime(2024, 1, 2, 3, 4, 5)),
+            ("2024-01-02 03:04:05.123456",
+             datetime.datetime(2024, 1, 2, 3, 4, 5, 123456)),
+            ("2024-01-02",
+             datetime.datetime(2024, 1, 2)),
+            ("2024-01-02 03:04:05+25:00", None),
+            ("2024-01-02 03:04:05+2400", None),
+            ("2024-02-30 03:04:05", None),
+            ("2024-01-02 24:00:00", None),
+            ("", None),
+            ("yesterday", None),
+        ):
+            result = f(value)
+            self.assertEqual(result, expected, msg=repr(value))
+            self.assertEqual(result, parse_date_strptime(value),
+                             msg=repr(value))
+            if result is not None:
+                self.assertEqual(result.tzinfo, expected.tzinfo,
+                                 msg=repr(value))
+
+
+class TestAttachment(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.dir = tempfile.TemporaryDirectory()
+        root = Path(os.path.realpath(cls.dir.name))
+        cls.root = root
+        cls.directory = directory = root / "export"
+        (directory / "sub").mkdir(parents=True)
+        for path in (
+            directory / "plain.jpg",
+            directory / "partial.part",
+            directory / "sub" / "hint.png",
+            directory / "sub" / "absolute.mp4",
+            root / "outside.png",
+        ):
+            path.write_bytes(b"")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.dir.cleanup()
+
+    def _attachment(self, data):
+        directory = self.directory
+        return twitter_index._attachment_from_metadata(
+            str(directory), directory / "meta.json", data,
+            twitter_index._list_directory(directory))
+
+    def test_attachment(self):
+        absolute = str(self.directory / "sub" / "absolute.mp4")
+        outside = (self.root / "outside.png").as_posix()
+
+        for data, expected in (
+            ({"filename": "plain", "extension": "jpg"},
+             ("plain.jpg", "image")),
+            ({"filename": "plain.jpg"},
+             ("plain.jpg", "image")),
+            ({"filename": "partial", "extension": "mp4"},
+             ("partial.part", "file")),
+            ({"_path": absolute, "filename": "plain", "extension": "jpg"},
+             ("sub/absolute.mp4", "video")),
+            ({"_path": "sub/hint.png", "filename": "plain",
+              "extension": "jpg"},
+             ("sub/hint.png", "image")),
+            ({"filepath": "sub/../sub/hint.png"},
+             ("sub/hint.png", "image")),
+            ({"_path": "../outside.png"},
+             (outside, "image")),
+            ({"_path": "sub/missing.png", "filename": "missing",
+              "extension": "jpg"},
+             None),
+            ({}, None),
+        ):
+            attachment = self._attachment(data)
+            if expected is None:
+                self.assertIsNone(attachment, msg=repr(data))
+            else:
+                self.assertEqual(
+                    (attachment.rel_path, attachment.media_type),
+                    expected, msg=repr(data))
+
+    def test_attachment_alt_text(self):
+        attachment = self._attachment(
+            {"filename": "plain.jpg", "description": "alt"})
+        self.assertEqual(attachment.alt_text, "alt")
+
+
+class TestAccumulator(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.dir = tempfile.TemporaryDirectory()
+        cls.directory = directory = Path(os.path.realpath(cls.dir.name))
+        for name in ("m1", "m2", "m3", "first", "second"):
+            (directory / (name + ".jpg")).write_bytes(b"")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.dir.cleanup()
+
+    def _finalize(self, records):
+        accumulator = twitter_index.TweetAccumulator(self.directory)
+        for num, data in enumerate(records):
+            data.setdefault("category", "twitter")
+            accumulator.feed(self.directory / f"{num}.json", data)
+        return accumulator.finalize()
+
+    def _attachments(self, tweet):
+        return [attachment.rel_path for attachment in tweet.attachments]
+
+    def test_attachment_order(self):
+        tweets = self._finalize([
+            {"tweet_id": 1, "num": num, "filename": f"m{num}.jpg"}
+            for num in (2, 1, 3)
+        ])
+        self.assertEqual(len(tweets), 1)
+        self.assertEqual(self._attachments(tweets[0]),
+                         ["m1.jpg", "m2.jpg", "m3.jpg"])
+
+    def test_attachment_order_sorted(self):
+        tweets = self._finalize([
+            {"tweet_id": 1, "num": num, "filename": f"m{num}.jpg"}
+            for num in (1, 2, 3)
+        ])
+        self.assertEqual(self._attachments(tweets[0]),
+                         ["m1.jpg", "m2.jpg", "m3.jpg"])
+
+    def test_attachment_repeated_num(self):
+        tweets = self._finalize([
+            {"tweet_id": 1, "num": 2, "filename": "m2.jpg"},
+            {"tweet_id": 1, "num": 1, "filename": "first.jpg"},
+            {"tweet_id": 1, "num": 1, "filename": "second.jpg"},
+        ])
+        self.assertEqual(self._attachments(tweets[0]),
+                         ["second.jpg", "m2.jpg"])
+
+
+class TestLoadJson(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.directory = Path(self.dir.name)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def _write(self, name, content):
+        path = self.directory / name
+        path.write_text(content, encoding="utf-8")
+        return path
+
+    def test_marker(self, f=twitter_index._load_json):
+        marker = twitter_index._TWITTER_MARKER
+        twitter = self._write("twitter.json", '{"category": "twitter"}')
+        other = self._write("other.json", '{"category": "instagram"}')
+        broken = self._write("broken.json", '{"category": "twitter"')
+
+        self.assertEqual(f(twitter, marker), {"category": "twitter"})
+        self.assertIsNone(f(other, marker))
+        self.assertEqual(f(other), {"category": "instagram"})
+        self.assertIsNone(f(broken, marker))
+        self.assertIsNone(f(self.directory / "missing.json", marker))
+
+    def test_build_indexes(self):
+        self._write("1.json", '{"category": "instagram", "id": 1}')
+        self._write("2.json", '{"category": "tumblr", "tags": ["twitter"]}')
+        self.assertEqual(twitter_index.build_indexes(
+            self.directory, parallel=False), [])
+
+        self._write("3.json", '{"category": "twitter", "tweet_id": 3}')
+        created = twitter_index.build_indexes(self.directory, parallel=False)
+        self.assertEqual(created, [self.directory.resolve() / "index.html"])
+
+
+class TestJsonl(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.dir.name) / "dump.jsonl"
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def _build(self, lines):
+        self.path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        with io.StringIO() as buffer:
+            stdout = sys.stdout
+            sys.stdout = buffer
+            try:
+                result = twitter_index.build_index_from_jsonl(self.path)
+            finally:
+                sys.stdout = stdout
+            return result, buffer.getvalue()
+
+    def test_jsonl(self):
+        result, output = self._build([
+            "[twitter][info] Requesting search results",
+            "",
+            "not json",
+            '"a string record"',
+            '{"category": "instagram", "search": "other"}',
+            '{"category": "twitter", "tweet_id": 1, "search": "cats", '
+            '"author": {"name": "ann"}, "date": "2024-01-01 10:00:00"}',
+            '{"category": "twitter", "tweet_id": 2, "content": "second", '
+            '"author": {"name": "bob"}, "date": "2024-01-02 10:00:00"}',
+            '{"category": "twitter", "tweet_id": 1, "content": "merged"}',
+        ])
+
+        self.assertEqual(result, self.path.with_suffix(".html").resolve())
+        self.assertEqual(output, (
+            "[twitter][info] Requesting search results\n"
+            "not json\n"
+            "a string record\n"
+        ))
+
+        page = result.read_text(encoding="utf-8")
+        self.assertIn("<title>Exports X.com – cats</title>", page)
+        self.assertIn("2 publication(s)", page)
+        self.assertIn("merged", page)
+        self.assertLess(page.index("https://x.com/bob/status/2"),
+                        page.index("https://x.com/ann/status/1"))
+
+    def test_jsonl_empty(self):
+        result, output = self._build([
+            "[twitter][error] HttpError: 404 Not Found",
+            '{"category": "instagram"}',
+        ])
+        self.assertIsNone(result)
+        self.assertEqual(output, "[twitter][error] HttpError: 404 Not Found\n")
+        self.assertFalse(self.path.with_suffix(".html").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()